@@ -54,8 +54,30 @@ CREATE TABLE expense_history (
 
 -- Create indexes for better performance
 CREATE INDEX idx_users_username ON users(username);
-CREATE INDEX idx_expenses_user_id ON expenses(user_id);
-CREATE INDEX idx_expense_history_user_id ON expense_history(user_id);
+CREATE INDEX idx_expenses_user_active_created ON expenses(user_id, is_active, created_at DESC);
+CREATE INDEX idx_history_user_expense ON expense_history(user_id, expense_id);
 CREATE INDEX idx_expense_history_date ON expense_history(date);
 
+-- Audit trail is written by triggers so each change is a single statement
+CREATE TRIGGER expenses_ai AFTER INSERT ON expenses
+BEGIN
+    INSERT INTO expense_history (user_id, expense_id, action, amount)
+    VALUES (NEW.user_id, NEW.id, 'CREATE', NEW.amount);
+END;
+
+CREATE TRIGGER expenses_au
+AFTER UPDATE OF name, amount, category, recurring, schedule ON expenses
+WHEN NEW.is_active = 1
+BEGIN
+    INSERT INTO expense_history (user_id, expense_id, action, amount)
+    VALUES (NEW.user_id, NEW.id, 'UPDATE', NEW.amount);
+END;
+
+CREATE TRIGGER expenses_ad AFTER UPDATE OF is_active ON expenses
+WHEN OLD.is_active = 1 AND NEW.is_active = 0
+BEGIN
+    INSERT INTO expense_history (user_id, expense_id, action, amount)
+    VALUES (OLD.user_id, OLD.id, 'DELETE', OLD.amount);
+END;
+
 COMMIT;
@@ -40,6 +40,32 @@ CREATE TABLE IF NOT EXISTS expense_history (
 
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
-CREATE INDEX IF NOT EXISTS idx_expenses_user_id ON expenses(user_id);
-CREATE INDEX IF NOT EXISTS idx_expense_history_user_id ON expense_history(user_id);
+CREATE INDEX IF NOT EXISTS idx_expenses_user_active_created ON expenses(user_id, is_active, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_history_user_expense ON expense_history(user_id, expense_id);
 CREATE INDEX IF NOT EXISTS idx_expense_history_date ON expense_history(date);
+
+-- Covered by the leading columns of the composite indexes above
+DROP INDEX IF EXISTS idx_expenses_user_id;
+DROP INDEX IF EXISTS idx_expense_history_user_id;
+
+-- Audit trail is written by triggers so each change is a single statement
+CREATE TRIGGER IF NOT EXISTS expenses_ai AFTER INSERT ON expenses
+BEGIN
+    INSERT INTO expense_history (user_id, expense_id, action, amount)
+    VALUES (NEW.user_id, NEW.id, 'CREATE', NEW.amount);
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_au
+AFTER UPDATE OF name, amount, category, recurring, schedule ON expenses
+WHEN NEW.is_active = 1
+BEGIN
+    INSERT INTO expense_history (user_id, expense_id, action, amount)
+    VALUES (NEW.user_id, NEW.id, 'UPDATE', NEW.amount);
+END;
+
+CREATE TRIGGER IF NOT EXISTS expenses_ad AFTER UPDATE OF is_active ON expenses
+WHEN OLD.is_active = 1 AND NEW.is_active = 0
+BEGIN
+    INSERT INTO expense_history (user_id, expense_id, action, amount)
+    VALUES (OLD.user_id, OLD.id, 'DELETE', OLD.amount);
+END;
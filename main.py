@@ -1,15 +1,15 @@
 import sqlite3
 import logging
+import logging.handlers
 import os
 import sys
-from datetime import datetime, timedelta
+import threading
+import weakref
+from datetime import timedelta
 from typing import Optional, List, Dict, Any
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 
-# Add utils to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
-
-from utils.password_hasher import hash_password, verify_password
+from utils.password_hasher import MAX_PASSWORD_BYTES, hash_password, verify_password
 from utils.validators import (
     validate_username, validate_password, validate_expense_name,
     validate_amount, validate_category, validate_schedule,
@@ -17,17 +17,76 @@ from utils.validators import (
 )
 
 # Configure logging
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# File output is buffered and flushed in batches, or immediately on errors
+_file_handler = logging.FileHandler('expense_manager.log')
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('expense_manager.log'),
+        logging.handlers.MemoryHandler(
+            capacity=100,
+            flushLevel=logging.ERROR,
+            target=_file_handler
+        ),
         logging.StreamHandler()
     ]
 )
 
 logger = logging.getLogger(__name__)
 
+# SQL statements shared by every call so sqlite3's statement cache can reuse
+# the compiled program instead of re-parsing the text each time.
+_SQL_CHECK_LOCK = "SELECT CASE WHEN locked_until > CURRENT_TIMESTAMP THEN 1 ELSE 0 END AS is_locked FROM users WHERE username = ?"
+_SQL_RECORD_FAILED_LOGIN = "UPDATE users SET failed_login_attempts = CASE WHEN locked_until <= CURRENT_TIMESTAMP THEN 0 ELSE failed_login_attempts END + 1, locked_until = CASE WHEN CASE WHEN locked_until <= CURRENT_TIMESTAMP THEN 0 ELSE failed_login_attempts END + 1 >= ? THEN datetime('now', '+' || ? || ' seconds') WHEN locked_until <= CURRENT_TIMESTAMP THEN NULL ELSE locked_until END WHERE username = ?"
+_SQL_RESET_FAILED_ATTEMPTS = "UPDATE users SET failed_login_attempts = 0, locked_until = NULL, last_login = CURRENT_TIMESTAMP WHERE username = ?"
+_SQL_INSERT_USER = "INSERT INTO users (username, password_hash) VALUES (?, ?)"
+_SQL_SELECT_USER = "SELECT id, password_hash, is_active FROM users WHERE username = ?"
+_SQL_INSERT_EXPENSE = "INSERT INTO expenses (user_id, name, amount, category, recurring, schedule) VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_SOFT_DELETE_EXPENSE = "UPDATE expenses SET is_active = 0, updated_at = CURRENT_TIMESTAMP WHERE id = ? AND user_id = ? AND is_active = 1 RETURNING id"
+_SQL_SELECT_EXPENSES = "SELECT id, name, amount, category, recurring, schedule, created_at FROM expenses WHERE user_id = ? AND is_active = 1 ORDER BY created_at DESC"
+_SQL_UPDATE_EXPENSE = "UPDATE expenses SET name = ?, amount = ?, category = ?, recurring = ?, schedule = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? AND user_id = ? AND is_active = 1 RETURNING id"
+
+# Before schema version 2, locked_until held local time from
+# datetime.isoformat(). The "T" separator sorts after CURRENT_TIMESTAMP's
+# space, so convert those values to UTC in SQLite's own format.
+_SQL_MIGRATE_LOCKED_UNTIL = "UPDATE users SET locked_until = datetime(locked_until, 'utc') WHERE locked_until LIKE '%T%'"
+
+# Bump whenever db/schema.sql or the fallback schema changes
+SCHEMA_VERSION = 3
+
+# Read once at import rather than on every ExpenseManager construction
+_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'db', 'schema.sql')
+try:
+    with open(_SCHEMA_PATH, 'r') as f:
+        _SCHEMA_SQL: Optional[str] = f.read()
+except OSError:
+    _SCHEMA_SQL = None
+
+_BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+class _ThreadConnection:
+    """Holds one thread's pooled connection in that thread's local storage."""
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+def _release_connection(pool: List[sqlite3.Connection], pool_lock, conn: sqlite3.Connection):
+    """Remove a finished thread's connection from the pool and close it."""
+    with pool_lock:
+        if conn not in pool:
+            # Already closed by ExpenseManager.close()
+            return
+        pool.remove(conn)
+    try:
+        conn.close()
+    except sqlite3.Error as e:
+        logger.warning("Failed to close database connection: %s", e)
+
 class DatabaseError(Exception):
     """Custom exception for database errors"""
     pass
@@ -44,16 +103,28 @@ class ExpenseManager:
     MAX_LOGIN_ATTEMPTS = 5
     LOCKOUT_DURATION = timedelta(minutes=30)
     
-    def __init__(self, db_path: str = 'expenses.db'):
+    def __init__(self, db_path: str = 'expenses.db', durable: bool = True):
         """
         Initialize the ExpenseManager.
         
         Args:
-            db_path (str): Path to the SQLite database file
+            db_path (str): Path to the SQLite database file, or '' for a
+                temporary database that is deleted on close(). '' and
+                ':memory:' databases are private to one connection, so all
+                threads share a single connection, one at a time.
+            durable (bool): Set to False for throwaway databases (e.g. tests)
+                to skip journaling to disk and fsyncs
         """
         self.db_path = db_path
+        self.durable = durable
+        self._private_db = db_path in ('', ':memory:')
         self.current_user_id = None
         self.current_username = None
+        self._local = threading.local()
+        self._conn_pool: List[sqlite3.Connection] = []
+        # Reentrant because a private database holds it across nested calls
+        self._pool_lock = threading.RLock()
+        self._lockout_seconds = int(self.LOCKOUT_DURATION.total_seconds())
         self._initialize_database()
         logger.info("ExpenseManager initialized")
     
@@ -61,21 +132,29 @@ class ExpenseManager:
         """Initialize the database with proper schema."""
         try:
             with self._get_db_connection() as conn:
-                # Read and execute schema
-                schema_path = os.path.join(os.path.dirname(__file__), 'db', 'schema.sql')
-                if os.path.exists(schema_path):
-                    with open(schema_path, 'r') as f:
-                        conn.executescript(f.read())
+                # Skip the DDL entirely when the schema is already installed
+                if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                    logger.info("Database schema is up to date")
+                    return
+                
+                if _SCHEMA_SQL is not None:
+                    self._run_schema_script(conn, _SCHEMA_SQL)
                 else:
                     # Fallback schema if file doesn't exist
                     self._create_fallback_schema(conn)
                 
-                conn.commit()
                 logger.info("Database initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize database: {e}")
+            logger.error("Failed to initialize database: %s", e)
             raise DatabaseError(f"Database initialization failed: {e}")
     
+    def _run_schema_script(self, conn: sqlite3.Connection, schema: str):
+        """Run schema DDL, migrate old rows and stamp SCHEMA_VERSION in a single transaction."""
+        conn.executescript(
+            f"BEGIN IMMEDIATE;\n{schema}\n{_SQL_MIGRATE_LOCKED_UNTIL};\n"
+            f"PRAGMA user_version = {SCHEMA_VERSION};\nCOMMIT;"
+        )
+    
     def _create_fallback_schema(self, conn: sqlite3.Connection):
         """Create fallback schema if schema.sql is not found."""
         schema = """
@@ -115,111 +194,166 @@ class ExpenseManager:
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
             FOREIGN KEY (expense_id) REFERENCES expenses(id) ON DELETE CASCADE
         );
+        
+        CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+        CREATE INDEX IF NOT EXISTS idx_expenses_user_active_created ON expenses(user_id, is_active, created_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_history_user_expense ON expense_history(user_id, expense_id);
+        DROP INDEX IF EXISTS idx_expenses_user_id;
+        DROP INDEX IF EXISTS idx_expense_history_user_id;
+        
+        -- Audit trail is written by triggers so each change is a single statement
+        CREATE TRIGGER IF NOT EXISTS expenses_ai AFTER INSERT ON expenses
+        BEGIN
+            INSERT INTO expense_history (user_id, expense_id, action, amount)
+            VALUES (NEW.user_id, NEW.id, 'CREATE', NEW.amount);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS expenses_au
+        AFTER UPDATE OF name, amount, category, recurring, schedule ON expenses
+        WHEN NEW.is_active = 1
+        BEGIN
+            INSERT INTO expense_history (user_id, expense_id, action, amount)
+            VALUES (NEW.user_id, NEW.id, 'UPDATE', NEW.amount);
+        END;
+        
+        CREATE TRIGGER IF NOT EXISTS expenses_ad AFTER UPDATE OF is_active ON expenses
+        WHEN OLD.is_active = 1 AND NEW.is_active = 0
+        BEGIN
+            INSERT INTO expense_history (user_id, expense_id, action, amount)
+            VALUES (OLD.user_id, OLD.id, 'DELETE', OLD.amount);
+        END;
         """
-        conn.executescript(schema)
+        self._run_schema_script(conn, schema)
+    
+    def _apply_pragmas(self, conn: sqlite3.Connection):
+        """Apply per-connection PRAGMAs for durability and concurrency."""
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self.durable:
+            # Keep the journal in memory and never fsync
+            conn.execute("PRAGMA journal_mode = MEMORY")
+            conn.execute("PRAGMA synchronous = OFF")
+        else:
+            if not self._private_db:
+                # WAL lets readers proceed while a writer commits
+                conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -20000")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.execute("PRAGMA mmap_size = 268435456")
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a new connection configured for this manager."""
+        # Autocommit: single statements commit on their own, and
+        # multi-statement work opens an explicit BEGIN
+        conn = sqlite3.connect(
+            self.db_path, timeout=30.0, check_same_thread=False,
+            cached_statements=256, isolation_level=None
+        )
+        self._apply_pragmas(conn)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _get_thread_connection(self) -> sqlite3.Connection:
+        """Return this thread's pooled connection, opening it on first use."""
+        if self._private_db:
+            # Another connection would open a separate, empty database
+            with self._pool_lock:
+                if not self._conn_pool:
+                    self._conn_pool.append(self._open_connection())
+                return self._conn_pool[0]
+        
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            conn = self._open_connection()
+            holder = _ThreadConnection(conn)
+            self._local.holder = holder
+            with self._pool_lock:
+                self._conn_pool.append(conn)
+            # Thread-local storage is dropped when the thread exits, which
+            # releases the connection instead of keeping it until close()
+            weakref.finalize(holder, _release_connection, self._conn_pool, self._pool_lock, conn)
+        return holder.conn
     
     @contextmanager
     def _get_db_connection(self):
-        """Get a database connection with proper error handling."""
+        """Get the pooled database connection with proper error handling."""
         conn = None
-        try:
-            conn = sqlite3.connect(self.db_path, timeout=30.0)
-            conn.execute("PRAGMA foreign_keys = ON")
-            conn.row_factory = sqlite3.Row
-            yield conn
-        except sqlite3.Error as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise DatabaseError(f"Database operation failed: {e}")
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Unexpected error: {e}")
-            raise
-        finally:
-            if conn:
-                conn.close()
+        # Roll back only a transaction opened inside this block, never one
+        # the caller already had open on the pooled connection
+        owns_transaction = False
+        # A shared private-database connection is used by one thread at a time
+        guard = self._pool_lock if self._private_db else nullcontext()
+        with guard:
+            try:
+                conn = self._get_thread_connection()
+                owns_transaction = not conn.in_transaction
+                yield conn
+            except sqlite3.Error as e:
+                if conn and owns_transaction:
+                    conn.rollback()
+                logger.error("Database error: %s", e)
+                raise DatabaseError(f"Database operation failed: {e}")
+            except Exception as e:
+                if conn and owns_transaction:
+                    conn.rollback()
+                logger.error("Unexpected error: %s", e)
+                raise
     
-    def _log_expense_history(self, conn: sqlite3.Connection, user_id: int, 
-                           expense_id: int, action: str, amount: float):
-        """Log expense changes for audit trail."""
-        try:
-            conn.execute(
-                "INSERT INTO expense_history (user_id, expense_id, action, amount) VALUES (?, ?, ?, ?)",
-                (user_id, expense_id, action, amount)
-            )
-        except Exception as e:
-            logger.warning(f"Failed to log expense history: {e}")
+    def close(self):
+        """Close all pooled database connections."""
+        with self._pool_lock:
+            # Emptied in place; thread finalizers hold a reference to this list
+            pool = self._conn_pool[:]
+            self._conn_pool.clear()
+        for conn in pool:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Failed to close database connection: %s", e)
+        self._local = threading.local()
     
     def _is_user_locked(self, username: str) -> bool:
         """Check if user account is locked due to failed login attempts."""
         try:
             with self._get_db_connection() as conn:
+                # Read-only so the check never waits on, or fails behind, a writer;
+                # an expired lock is cleared by the next failed or successful login
                 cursor = conn.execute(
-                    "SELECT failed_login_attempts, locked_until FROM users WHERE username = ?",
+                    _SQL_CHECK_LOCK,
                     (username,)
                 )
                 row = cursor.fetchone()
                 
-                if not row:
-                    return False
-                
-                failed_attempts, locked_until = row
-                
-                if locked_until:
-                    locked_until_dt = datetime.fromisoformat(locked_until)
-                    if datetime.now() < locked_until_dt:
-                        return True
-                    else:
-                        # Unlock the account
-                        conn.execute(
-                            "UPDATE users SET failed_login_attempts = 0, locked_until = NULL WHERE username = ?",
-                            (username,)
-                        )
-                        conn.commit()
-                
-                return False
+                return bool(row and row['is_locked'])
         except Exception as e:
-            logger.error(f"Error checking user lock status: {e}")
+            logger.error("Error checking user lock status: %s", e)
             return False
     
     def _handle_failed_login(self, username: str):
         """Handle failed login attempt."""
         try:
             with self._get_db_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT failed_login_attempts FROM users WHERE username = ?",
-                    (username,)
+                # Increment and lock atomically so concurrent failures can't race;
+                # an expired lock restarts the count. SQLite computes locked_until
+                # in the same format as CURRENT_TIMESTAMP
+                conn.execute(
+                    _SQL_RECORD_FAILED_LOGIN,
+                    (self.MAX_LOGIN_ATTEMPTS, self._lockout_seconds, username)
                 )
-                row = cursor.fetchone()
-                
-                if row:
-                    failed_attempts = row[0] + 1
-                    locked_until = None
-                    
-                    if failed_attempts >= self.MAX_LOGIN_ATTEMPTS:
-                        locked_until = (datetime.now() + self.LOCKOUT_DURATION).isoformat()
-                    
-                    conn.execute(
-                        "UPDATE users SET failed_login_attempts = ?, locked_until = ? WHERE username = ?",
-                        (failed_attempts, locked_until, username)
-                    )
-                    conn.commit()
         except Exception as e:
-            logger.error(f"Error handling failed login: {e}")
+            logger.error("Error handling failed login: %s", e)
     
     def _reset_failed_login_attempts(self, username: str):
         """Reset failed login attempts on successful login."""
         try:
             with self._get_db_connection() as conn:
                 conn.execute(
-                    "UPDATE users SET failed_login_attempts = 0, locked_until = NULL, last_login = CURRENT_TIMESTAMP WHERE username = ?",
+                    _SQL_RESET_FAILED_ATTEMPTS,
                     (username,)
                 )
-                conn.commit()
         except Exception as e:
-            logger.error(f"Error resetting failed login attempts: {e}")
+            logger.error("Error resetting failed login attempts: %s", e)
     
     def create_user(self, username: str, password: str) -> int:
         """
@@ -246,13 +380,12 @@ class ExpenseManager:
             
             with self._get_db_connection() as conn:
                 cursor = conn.execute(
-                    "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+                    _SQL_INSERT_USER,
                     (username, password_hash)
                 )
                 user_id = cursor.lastrowid
-                conn.commit()
                 
-                logger.info(f"User created successfully: {username} (ID: {user_id})")
+                logger.info("User created successfully: %s (ID: %s)", username, user_id)
                 return user_id
                 
         except ValidationError:
@@ -262,7 +395,7 @@ class ExpenseManager:
                 raise ValidationError("Username already exists")
             raise DatabaseError(f"Failed to create user: {e}")
         except Exception as e:
-            logger.error(f"Error creating user: {e}")
+            logger.error("Error creating user: %s", e)
             raise DatabaseError(f"Failed to create user: {e}")
     
     def login_user(self, username: str, password: str) -> bool:
@@ -290,7 +423,7 @@ class ExpenseManager:
             
             with self._get_db_connection() as conn:
                 cursor = conn.execute(
-                    "SELECT id, password_hash, is_active FROM users WHERE username = ?",
+                    _SQL_SELECT_USER,
                     (username,)
                 )
                 row = cursor.fetchone()
@@ -304,11 +437,13 @@ class ExpenseManager:
                 if not is_active:
                     raise AuthenticationError("Account is deactivated")
                 
-                if verify_password(password, stored_hash):
+                # Skip the bcrypt work for hashes it can never accept
+                if (stored_hash and stored_hash.startswith(_BCRYPT_PREFIXES)
+                        and verify_password(password, stored_hash)):
                     self._reset_failed_login_attempts(username)
                     self.current_user_id = user_id
                     self.current_username = username
-                    logger.info(f"User logged in successfully: {username}")
+                    logger.info("User logged in successfully: %s", username)
                     return True
                 else:
                     self._handle_failed_login(username)
@@ -317,13 +452,13 @@ class ExpenseManager:
         except (ValidationError, AuthenticationError):
             raise
         except Exception as e:
-            logger.error(f"Error during login: {e}")
+            logger.error("Error during login: %s", e)
             raise AuthenticationError("Login failed due to system error")
     
     def logout(self):
         """Logout the current user."""
         if self.current_username:
-            logger.info(f"User logged out: {self.current_username}")
+            logger.info("User logged out: %s", self.current_username)
         self.current_user_id = None
         self.current_username = None
     
@@ -354,29 +489,76 @@ class ExpenseManager:
             # Validate inputs
             name = validate_expense_name(sanitize_input(name))
             amount = validate_amount(amount)
-            category = validate_category(sanitize_input(category))
-            schedule = validate_schedule(sanitize_input(schedule)) if schedule else None
+            category = sys.intern(validate_category(sanitize_input(category)))
+            schedule = validate_schedule(schedule)
             
             with self._get_db_connection() as conn:
                 cursor = conn.execute(
-                    "INSERT INTO expenses (user_id, name, amount, category, recurring, schedule) VALUES (?, ?, ?, ?, ?, ?)",
+                    _SQL_INSERT_EXPENSE,
                     (self.current_user_id, name, amount, category, recurring, schedule)
                 )
                 expense_id = cursor.lastrowid
                 
-                # Log to history
-                self._log_expense_history(conn, self.current_user_id, expense_id, 'CREATE', amount)
-                
-                conn.commit()
-                logger.info(f"Expense added: {name} (${amount}) for user {self.current_username}")
+                logger.info("Expense added: %s ($%s) for user %s", name, amount, self.current_username)
                 return expense_id
                 
         except ValidationError:
             raise
         except Exception as e:
-            logger.error(f"Error adding expense: {e}")
+            logger.error("Error adding expense: %s", e)
             raise DatabaseError(f"Failed to add expense: {e}")
     
+    def add_expenses_bulk(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Add several expenses in a single transaction.
+        
+        Args:
+            items (List[Dict]): Expenses with 'name' and 'amount' keys and
+                optional 'category', 'recurring' and 'schedule' keys
+            
+        Returns:
+            int: Number of expenses added
+            
+        Raises:
+            AuthenticationError: If user not logged in
+            ValidationError: If any item fails validation (nothing is added)
+            DatabaseError: If database operation fails
+        """
+        if not self.current_user_id:
+            raise AuthenticationError("Must be logged in to add expenses")
+        
+        try:
+            # Validate every item before writing so a bad row adds nothing
+            params = []
+            for item in items:
+                params.append((
+                    self.current_user_id,
+                    validate_expense_name(sanitize_input(item.get('name'))),
+                    validate_amount(item.get('amount')),
+                    sys.intern(validate_category(sanitize_input(item.get('category', "General")))),
+                    item.get('recurring', False),
+                    validate_schedule(item.get('schedule'))
+                ))
+            
+            with self._get_db_connection() as conn:
+                # Join a transaction the caller already has open rather than
+                # committing it from here
+                owns_transaction = not conn.in_transaction
+                if owns_transaction:
+                    conn.execute("BEGIN")
+                conn.executemany(_SQL_INSERT_EXPENSE, params)
+                
+                if owns_transaction:
+                    conn.commit()
+                logger.info("Expenses added: %s for user %s", len(params), self.current_username)
+                return len(params)
+                
+        except ValidationError:
+            raise
+        except Exception as e:
+            logger.error("Error adding expenses: %s", e)
+            raise DatabaseError(f"Failed to add expenses: {e}")
+    
     def remove_expense(self, expense_id: int) -> bool:
         """
         Remove an expense.
@@ -397,35 +579,22 @@ class ExpenseManager:
         
         try:
             with self._get_db_connection() as conn:
-                # Check if expense exists and belongs to user
+                # Soft delete, matching only active expenses owned by the user
                 cursor = conn.execute(
-                    "SELECT amount FROM expenses WHERE id = ? AND user_id = ? AND is_active = 1",
+                    _SQL_SOFT_DELETE_EXPENSE,
                     (expense_id, self.current_user_id)
                 )
-                row = cursor.fetchone()
                 
-                if not row:
+                if not cursor.fetchone():
                     raise ValidationError("Expense not found or access denied")
                 
-                amount = row[0]
-                
-                # Soft delete
-                conn.execute(
-                    "UPDATE expenses SET is_active = 0, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                    (expense_id,)
-                )
-                
-                # Log to history
-                self._log_expense_history(conn, self.current_user_id, expense_id, 'DELETE', amount)
-                
-                conn.commit()
-                logger.info(f"Expense removed: ID {expense_id} for user {self.current_username}")
+                logger.info("Expense removed: ID %s for user %s", expense_id, self.current_username)
                 return True
                 
         except ValidationError:
             raise
         except Exception as e:
-            logger.error(f"Error removing expense: {e}")
+            logger.error("Error removing expense: %s", e)
             raise DatabaseError(f"Failed to remove expense: {e}")
     
     def get_expenses(self) -> List[Dict[str, Any]]:
@@ -433,7 +602,8 @@ class ExpenseManager:
         Get all active expenses for the current user.
         
         Returns:
-            List[Dict]: List of expense dictionaries
+            List[Dict]: List of expense dictionaries; 'recurring' is the
+            stored 0/1 flag rather than a bool
             
         Raises:
             AuthenticationError: If user not logged in
@@ -445,26 +615,14 @@ class ExpenseManager:
         try:
             with self._get_db_connection() as conn:
                 cursor = conn.execute(
-                    "SELECT id, name, amount, category, recurring, schedule, created_at FROM expenses WHERE user_id = ? AND is_active = 1 ORDER BY created_at DESC",
+                    _SQL_SELECT_EXPENSES,
                     (self.current_user_id,)
                 )
                 
-                expenses = []
-                for row in cursor.fetchall():
-                    expenses.append({
-                        'id': row[0],
-                        'name': row[1],
-                        'amount': row[2],
-                        'category': row[3],
-                        'recurring': bool(row[4]),
-                        'schedule': row[5],
-                        'created_at': row[6]
-                    })
-                
-                return expenses
+                return [dict(row) for row in cursor]
                 
         except Exception as e:
-            logger.error(f"Error getting expenses: {e}")
+            logger.error("Error getting expenses: %s", e)
             raise DatabaseError(f"Failed to get expenses: {e}")
     
     def update_expense(self, expense_id: int, name: str, amount: float, 
@@ -496,38 +654,31 @@ class ExpenseManager:
             # Validate inputs
             name = validate_expense_name(sanitize_input(name))
             amount = validate_amount(amount)
-            category = validate_category(sanitize_input(category))
-            schedule = validate_schedule(sanitize_input(schedule)) if schedule else None
+            category = sys.intern(validate_category(sanitize_input(category)))
+            schedule = validate_schedule(schedule)
             
             with self._get_db_connection() as conn:
-                # Check if expense exists and belongs to user
+                # Update expense, matching only active expenses owned by the user
                 cursor = conn.execute(
-                    "SELECT id FROM expenses WHERE id = ? AND user_id = ? AND is_active = 1",
-                    (expense_id, self.current_user_id)
+                    _SQL_UPDATE_EXPENSE,
+                    (name, amount, category, recurring, schedule, expense_id, self.current_user_id)
                 )
                 
                 if not cursor.fetchone():
                     raise ValidationError("Expense not found or access denied")
                 
-                # Update expense
-                conn.execute(
-                    "UPDATE expenses SET name = ?, amount = ?, category = ?, recurring = ?, schedule = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
-                    (name, amount, category, recurring, schedule, expense_id)
-                )
-                
-                # Log to history
-                self._log_expense_history(conn, self.current_user_id, expense_id, 'UPDATE', amount)
-                
-                conn.commit()
-                logger.info(f"Expense updated: ID {expense_id} for user {self.current_username}")
+                logger.info("Expense updated: ID %s for user %s", expense_id, self.current_username)
                 return True
                 
         except ValidationError:
             raise
         except Exception as e:
-            logger.error(f"Error updating expense: {e}")
+            logger.error("Error updating expense: %s", e)
             raise DatabaseError(f"Failed to update expense: {e}")
 
+_EXPENSE_HEADER = f"{'ID':<5} {'Name':<20} {'Amount':<10} {'Category':<15} {'Recurring':<10} {'Schedule':<10}"
+_EXPENSE_ROW_FORMAT = "{:<5} {:<20} ${:<9.2f} {:<15} {:<10} {:<10}"
+
 def main():
     """Main application loop with improved error handling."""
     manager = ExpenseManager()
@@ -561,6 +712,7 @@ def main():
                     print("\n--- Create New Account ---")
                     print("Password requirements:")
                     print("- At least 8 characters")
+                    print(f"- At most {MAX_PASSWORD_BYTES} bytes ({MAX_PASSWORD_BYTES} plain ASCII characters, fewer with accented letters)")
                     print("- At least one uppercase letter")
                     print("- At least one lowercase letter")
                     print("- At least one digit")
@@ -620,12 +772,17 @@ def main():
                         if not expenses:
                             print("No expenses found.")
                         else:
-                            print(f"{'ID':<5} {'Name':<20} {'Amount':<10} {'Category':<15} {'Recurring':<10} {'Schedule':<10}")
-                            print("-" * 80)
-                            for expense in expenses:
-                                recurring_text = "Yes" if expense['recurring'] else "No"
-                                schedule_text = expense['schedule'] or "-"
-                                print(f"{expense['id']:<5} {expense['name'][:19]:<20} ${expense['amount']:<9.2f} {expense['category']:<15} {recurring_text:<10} {schedule_text:<10}")
+                            # Render the whole table and write it in one call
+                            rows = [_EXPENSE_HEADER, "-" * 80]
+                            rows.extend(
+                                _EXPENSE_ROW_FORMAT.format(
+                                    expense['id'], expense['name'][:19], expense['amount'],
+                                    expense['category'], "Yes" if expense['recurring'] else "No",
+                                    expense['schedule'] or "-"
+                                )
+                                for expense in expenses
+                            )
+                            sys.stdout.write("\n".join(rows) + "\n")
                     
                     except DatabaseError as e:
                         print(f"\n✗ Failed to get expenses: {e}")
@@ -686,9 +843,11 @@ def main():
             manager.logout()
             break
         except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}")
+            logger.error("Unexpected error in main loop: %s", e)
             print(f"\n✗ An unexpected error occurred: {e}")
             print("Please try again or contact support if the problem persists.")
 
+    manager.close()
+
 if __name__ == "__main__":
     main()
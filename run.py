@@ -10,8 +10,13 @@ import sys
 import os
 import subprocess
 import logging
+import importlib
+from importlib.util import find_spec
 from pathlib import Path
 
+# Resolved once; used for the sys.path entry and the logs directory
+_HERE = Path(__file__).resolve().parent
+
 def check_python_version():
     """Check if Python version is compatible."""
     if sys.version_info < (3, 8):
@@ -23,13 +28,9 @@ def check_python_version():
 def check_dependencies():
     """Check if required dependencies are installed."""
     required_packages = ['bcrypt', 'cryptography']
-    missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
-            missing_packages.append(package)
+    # Only locate the packages; importing them would load their C extensions
+    missing_packages = [p for p in required_packages if find_spec(p) is None]
     
     if missing_packages:
         print("Error: Missing required dependencies:")
@@ -44,7 +45,7 @@ def check_dependencies():
 def setup_environment():
     """Setup the application environment."""
     # Add current directory to Python path
-    current_dir = Path(__file__).parent.absolute()
+    current_dir = _HERE
     if str(current_dir) not in sys.path:
         sys.path.insert(0, str(current_dir))
     
@@ -52,6 +53,9 @@ def setup_environment():
     logs_dir = current_dir / "logs"
     logs_dir.mkdir(exist_ok=True)
     
+    # Let SQLite spill temp files next to the app rather than into a small /tmp
+    os.environ.setdefault("SQLITE_TMPDIR", str(logs_dir))
+    
     return True
 
 def install_dependencies():
@@ -62,6 +66,8 @@ def install_dependencies():
             sys.executable, "-m", "pip", "install", "-r", "requirements.txt"
         ])
         print("Dependencies installed successfully!")
+        # Let find_spec see the newly installed packages
+        importlib.invalidate_caches()
         return True
     except subprocess.CalledProcessError as e:
         print(f"Failed to install dependencies: {e}")
@@ -1,14 +1,40 @@
-import bcrypt
 import logging
+import os
 
-logger = logging.getLogger(__name__)
+# bcrypt is imported inside the functions below so that importing utils for
+# validation alone doesn't load its C extension
 
-def hash_password(password: str) -> str:
+def _rounds_from_env(default: int = 12) -> int:
+    """Read EXPENSE_BCRYPT_ROUNDS, clamped to bcrypt's valid range of 4-31."""
+    try:
+        rounds = int(os.environ.get('EXPENSE_BCRYPT_ROUNDS', default))
+    except ValueError:
+        # A bad override must not stop the package from importing
+        return default
+    return min(max(rounds, 4), 31)
+
+# bcrypt cost factor; each increment doubles hashing time. EXPENSE_BCRYPT_ROUNDS
+# overrides it, e.g. to the minimum of 4 for test runs.
+DEFAULT_ROUNDS = _rounds_from_env()
+
+# bcrypt only uses the first 72 bytes of a password. bcrypt 4.x silently
+# truncates longer input and 5.x raises, so new passwords are capped here.
+MAX_PASSWORD_BYTES = 72
+
+def _to_bytes(value: str) -> bytes:
+    """Encode text for bcrypt; ASCII input yields the same bytes as UTF-8."""
+    try:
+        return value.encode('ascii')
+    except UnicodeEncodeError:
+        return value.encode('utf-8')
+
+def hash_password(password: str, rounds: int = DEFAULT_ROUNDS) -> str:
     """
     Hash a password using bcrypt with salt.
     
     Args:
         password (str): Plain text password
+        rounds (int): bcrypt cost factor (4-31)
         
     Returns:
         str: Hashed password
@@ -17,6 +43,8 @@ def hash_password(password: str) -> str:
         ValueError: If password is empty or None
         Exception: If hashing fails
     """
+    import bcrypt
+    
     try:
         if not password or not password.strip():
             raise ValueError("Password cannot be empty")
@@ -24,15 +52,20 @@ def hash_password(password: str) -> str:
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters long")
         
+        password_bytes = _to_bytes(password)
+        if len(password_bytes) > MAX_PASSWORD_BYTES:
+            raise ValueError(f"Password cannot exceed {MAX_PASSWORD_BYTES} bytes")
+        
         # Generate salt and hash password
-        salt = bcrypt.gensalt(rounds=12)
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+        salt = bcrypt.gensalt(rounds=rounds)
+        hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
     
     except ValueError:
         raise
     except Exception as e:
-        logger.error(f"Error hashing password: {e}")
+        # Only failures log, so look the logger up here rather than at import
+        logging.getLogger(__name__).error("Error hashing password: %s", e)
         raise Exception("Failed to hash password")
 
 def verify_password(password: str, hashed_password: str) -> bool:
@@ -50,14 +83,19 @@ def verify_password(password: str, hashed_password: str) -> bool:
         ValueError: If inputs are invalid
         Exception: If verification fails
     """
+    import bcrypt
+    
     try:
         if not password or not hashed_password:
             raise ValueError("Password and hash cannot be empty")
         
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        # Accounts created before the length cap was enforced were hashed by
+        # bcrypt 4.x on the first 72 bytes only, so check those same bytes
+        password_bytes = _to_bytes(password)[:MAX_PASSWORD_BYTES]
+        return bcrypt.checkpw(password_bytes, _to_bytes(hashed_password))
     
     except ValueError:
         raise
     except Exception as e:
-        logger.error(f"Error verifying password: {e}")
+        logging.getLogger(__name__).error("Error verifying password: %s", e)
         return False
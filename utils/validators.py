@@ -1,9 +1,21 @@
-import re
-import logging
-from typing import Union, Optional
-from datetime import datetime
+from __future__ import annotations
 
-logger = logging.getLogger(__name__)
+import string
+from typing import TYPE_CHECKING
+
+from .password_hasher import MAX_PASSWORD_BYTES
+
+if TYPE_CHECKING:
+    from typing import Union, Optional
+
+# Character deletion tables for str.translate, which avoids the regex engine
+_DANGEROUS_TABLE = str.maketrans('', '', '<>"\'')
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7f, 0xa0)])
+
+_ASCII_UPPER = frozenset(string.ascii_uppercase)
+_ASCII_LOWER = frozenset(string.ascii_lowercase)
+
+_SCHEDULES = frozenset({'daily', 'weekly', 'monthly', 'yearly'})
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
@@ -22,7 +34,7 @@ def validate_username(username: str) -> str:
     Raises:
         ValidationError: If username is invalid
     """
-    if not username or not isinstance(username, str):
+    if not isinstance(username, str) or not username:
         raise ValidationError("Username is required")
     
     username = username.strip()
@@ -34,7 +46,8 @@ def validate_username(username: str) -> str:
         raise ValidationError("Username must be less than 50 characters")
     
     # Allow alphanumeric characters, underscores, and hyphens
-    if not re.match(r'^[a-zA-Z0-9_-]+$', username):
+    core = username.replace('_', '').replace('-', '')
+    if not username.isascii() or (core and not core.isalnum()):
         raise ValidationError("Username can only contain letters, numbers, underscores, and hyphens")
     
     return username
@@ -58,17 +71,29 @@ def validate_password(password: str) -> str:
     if len(password) < 8:
         raise ValidationError("Password must be at least 8 characters long")
     
-    if len(password) > 128:
-        raise ValidationError("Password must be less than 128 characters")
-    
-    # Check for at least one uppercase, one lowercase, one digit
-    if not re.search(r'[A-Z]', password):
+    # bcrypt's limit is in bytes, so multi-byte characters count more than once
+    if len(password.encode('utf-8')) > MAX_PASSWORD_BYTES:
+        raise ValidationError(f"Password cannot exceed {MAX_PASSWORD_BYTES} bytes")
+    
+    # Check for at least one uppercase, one lowercase, one digit in one pass
+    has_upper = has_lower = has_digit = False
+    for c in password:
+        if c in _ASCII_UPPER:
+            has_upper = True
+        elif c in _ASCII_LOWER:
+            has_lower = True
+        elif c.isdecimal():
+            has_digit = True
+        if has_upper and has_lower and has_digit:
+            break
+    
+    if not has_upper:
         raise ValidationError("Password must contain at least one uppercase letter")
     
-    if not re.search(r'[a-z]', password):
+    if not has_lower:
         raise ValidationError("Password must contain at least one lowercase letter")
     
-    if not re.search(r'\d', password):
+    if not has_digit:
         raise ValidationError("Password must contain at least one digit")
     
     return password
@@ -86,19 +111,19 @@ def validate_expense_name(name: str) -> str:
     Raises:
         ValidationError: If name is invalid
     """
-    if not name or not isinstance(name, str):
+    if not isinstance(name, str) or not name:
         raise ValidationError("Expense name is required")
     
     name = name.strip()
     
-    if len(name) < 1:
+    if not name:
         raise ValidationError("Expense name cannot be empty")
     
     if len(name) > 100:
         raise ValidationError("Expense name must be less than 100 characters")
     
     # Remove any potentially dangerous characters
-    name = re.sub(r'[<>"\']', '', name)
+    name = name.translate(_DANGEROUS_TABLE)
     
     return name
 
@@ -115,26 +140,35 @@ def validate_amount(amount: Union[str, float, int]) -> float:
     Raises:
         ValidationError: If amount is invalid
     """
-    try:
+    amount_type = type(amount)
+    # Amounts read back from the database are already rounded to cents;
+    # return those as-is instead of paying for round()
+    if amount_type is float and 0 < amount <= 999999.99:
+        cents = int(amount * 100 + 0.5)
+        if cents / 100 == amount:
+            return amount
+    
+    # Plain floats and ints skip straight to the range check
+    if amount_type is not float and amount_type is not int:
         if isinstance(amount, str):
             amount = amount.strip()
             if not amount:
                 raise ValidationError("Amount is required")
-            amount = float(amount)
+            try:
+                amount = float(amount)
+            except ValueError:
+                raise ValidationError("Amount must be a valid number")
         elif not isinstance(amount, (int, float)):
             raise ValidationError("Amount must be a number")
-        
-        if amount <= 0:
-            raise ValidationError("Amount must be greater than 0")
-        
-        if amount > 999999.99:
-            raise ValidationError("Amount cannot exceed 999,999.99")
-        
-        # Round to 2 decimal places
-        return round(float(amount), 2)
     
-    except ValueError:
-        raise ValidationError("Amount must be a valid number")
+    if amount <= 0:
+        raise ValidationError("Amount must be greater than 0")
+    
+    if amount > 999999.99:
+        raise ValidationError("Amount cannot exceed 999,999.99")
+    
+    # Round to 2 decimal places
+    return round(float(amount), 2)
 
 def validate_category(category: Optional[str]) -> str:
     """
@@ -146,19 +180,19 @@ def validate_category(category: Optional[str]) -> str:
     Returns:
         str: Validated category
     """
-    if not category:
-        return "General"
-    
     if not isinstance(category, str):
         return "General"
     
     category = category.strip()
     
+    if not category:
+        return "General"
+    
     if len(category) > 50:
         category = category[:50]
     
     # Remove potentially dangerous characters
-    category = re.sub(r'[<>"\']', '', category)
+    category = category.translate(_DANGEROUS_TABLE)
     
     return category if category else "General"
 
@@ -170,22 +204,28 @@ def validate_schedule(schedule: Optional[str]) -> Optional[str]:
         schedule: Schedule to validate
         
     Returns:
-        str or None: Validated schedule
+        str or None: Validated schedule, or None if no schedule was given
+        
+    Raises:
+        ValidationError: If schedule is not a known schedule
     """
     if not schedule:
         return None
     
+    # Checked before the set lookup, which raises TypeError for unhashable input
     if not isinstance(schedule, str):
-        return None
+        raise ValidationError("Schedule must be daily, weekly, monthly, or yearly")
     
-    schedule = schedule.strip().lower()
+    if schedule in _SCHEDULES:
+        return schedule
     
-    valid_schedules = ['daily', 'weekly', 'monthly', 'yearly']
+    # Slow path for values that need normalizing, e.g. " Weekly"
+    schedule = schedule.strip().lower()
     
-    if schedule in valid_schedules:
-        return schedule
+    if schedule not in _SCHEDULES:
+        raise ValidationError("Schedule must be daily, weekly, monthly, or yearly")
     
-    return None
+    return schedule
 
 def sanitize_input(input_str: str) -> str:
     """
@@ -201,7 +241,7 @@ def sanitize_input(input_str: str) -> str:
         return ""
     
     # Remove null bytes and control characters
-    sanitized = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', input_str)
+    sanitized = input_str.translate(_CTRL_TABLE)
     
     # Limit length
     if len(sanitized) > 1000: